@@ -1,4 +1,10 @@
 import asyncio
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and unavailable on Windows
+    uvloop = None
+
 from voyager import Voyager
 from voyager.types import VoyagerTask
 
@@ -79,4 +85,7 @@ NOTE: The link you're looking for is typically NOT the press release itself, but
     await browser_pool.stop() # Stop the browser pool
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -18,6 +18,8 @@ class BrowserPool:
     - CDP endpoint support for remote browsers
     - Anti-bot detection with stealth mode and user agent rotation
     - Automatic browser creation when pool is exhausted
+    - Periodic relaunch of local browsers to bound Chromium memory growth
+    - Optional pre-warmed, reusable contexts to skip per-task context creation
     """
 
     def __init__(
@@ -27,6 +29,8 @@ class BrowserPool:
         cdp_endpoints: Optional[List[str]] = None,
         launch_options: Optional[LaunchOptions] = None,
         enable_anti_bot: bool = False,
+        recycle_browser_after: Optional[int] = 200,
+        context_reuse_limit: Optional[int] = None,
     ):
         """
         Initialize the browser pool.
@@ -37,15 +41,29 @@ class BrowserPool:
             cdp_endpoints: List of CDP URLs for remote browser connections
             launch_options: Browser launch configuration
             enable_anti_bot: Enable stealth mode and user agent rotation
+            recycle_browser_after: Relaunch a locally launched browser after it has
+                served this many contexts (None disables recycling)
+            context_reuse_limit: When set, contexts requested without custom arguments
+                are pre-warmed at start, reset (pages closed, cookies cleared) on
+                release and reused for up to this many tasks. Reused contexts keep
+                their local storage and user agent. None creates a fresh context
+                per request.
         """
         self.max_contexts_per_browser = max_contexts_per_browser
         self.max_browsers = max_browsers
         self.cdp_endpoints = cdp_endpoints or []
         self.launch_options = launch_options or {"headless": True}
         self.enable_anti_bot = enable_anti_bot
+        self.recycle_browser_after = recycle_browser_after
+        self.context_reuse_limit = context_reuse_limit
         
         self.browsers: List[Browser] = []
         self.browser_semaphores: List[asyncio.Semaphore] = []
+        self.remote_browsers: set[Browser] = set()
+        self.contexts_served: Dict[Browser, int] = {}
+        self.active_contexts: Dict[Browser, int] = {}
+        self.idle_contexts: Dict[Browser, List[BrowserContext]] = {}
+        self.context_uses: Dict[BrowserContext, int] = {}
         self.playwright: Optional[Playwright] = None
         self.lock = asyncio.Lock()
         self._started = False
@@ -60,21 +78,31 @@ class BrowserPool:
 
         self.playwright = await async_playwright().start()
 
-        # Connect to remote browsers via CDP if endpoints provided
-        for endpoint in self.cdp_endpoints:
-            try:
-                browser = await self.playwright.chromium.connect_over_cdp(endpoint)
-                self.browsers.append(browser)
-                self.browser_semaphores.append(
-                    asyncio.Semaphore(self.max_contexts_per_browser)
-                )
-            except Exception as e:
-                print(f"Failed to connect to CDP endpoint {endpoint}: {e}")
+        # Connect to remote browsers via CDP if endpoints provided, all at once
+        # so one slow endpoint does not delay the others
+        results = await asyncio.gather(
+            *(self.playwright.chromium.connect_over_cdp(endpoint) for endpoint in self.cdp_endpoints),
+            return_exceptions=True
+        )
+        for endpoint, result in zip(self.cdp_endpoints, results):
+            if isinstance(result, BaseException):
+                print(f"Failed to connect to CDP endpoint {endpoint}: {result}")
+                continue
+            self.remote_browsers.add(result)
+            self._register_browser(result)
 
         # Launch at least one browser if no CDP connections succeeded
         if not self.browsers:
             await self._create_browser()
 
+        # Pre-warm reusable contexts so the first tasks skip context creation
+        if self.context_reuse_limit:
+            for browser in self.browsers:
+                self.idle_contexts[browser] = list(await asyncio.gather(*(
+                    self._new_context(browser)
+                    for _ in range(self.max_contexts_per_browser)
+                )))
+
         self._started = True
 
     async def stop(self) -> None:
@@ -94,6 +122,11 @@ class BrowserPool:
 
         self.browsers.clear()
         self.browser_semaphores.clear()
+        self.remote_browsers.clear()
+        self.contexts_served.clear()
+        self.active_contexts.clear()
+        self.idle_contexts.clear()
+        self.context_uses.clear()
         self._started = False
 
     async def _create_browser(self) -> Browser:
@@ -102,35 +135,84 @@ class BrowserPool:
             raise RuntimeError("BrowserPool not started. Call start() first.")
 
         browser = await self.playwright.chromium.launch(**self.launch_options)
+        self._register_browser(browser)
+        return browser
+
+    def _register_browser(self, browser: Browser) -> None:
+        """Add a browser to the pool with its own context semaphore."""
         self.browsers.append(browser)
         self.browser_semaphores.append(
             asyncio.Semaphore(self.max_contexts_per_browser)
         )
-        return browser
+        self._track_browser(browser)
 
-    async def _get_available_browser(self) -> tuple[Browser, asyncio.Semaphore]:
+    def _track_browser(self, browser: Browser) -> None:
+        """Reset the per-browser bookkeeping for a newly added browser."""
+        self.contexts_served[browser] = 0
+        self.active_contexts[browser] = 0
+        self.idle_contexts[browser] = []
+
+    async def _get_available_browser(self) -> int:
         """
-        Get an available browser with capacity for new contexts.
+        Get the index of an available browser with capacity for new contexts.
         Creates new browsers if needed and within limits.
         """
         # Quick check for immediately available browser
-        for browser, sem in zip(self.browsers, self.browser_semaphores):
+        for index, sem in enumerate(self.browser_semaphores):
             if not sem.locked():
-                return browser, sem
+                return index
 
         # Try to create a new browser if under limit
         async with self.lock:
             if len(self.browsers) < self.max_browsers:
-                browser = await self._create_browser()
-                return browser, self.browser_semaphores[-1]
+                await self._create_browser()
+                return len(self.browsers) - 1
 
         # Wait for any browser to become available
         while True:
-            for browser, sem in zip(self.browsers, self.browser_semaphores):
+            for index, sem in enumerate(self.browser_semaphores):
                 if not sem.locked():
-                    return browser, sem
+                    return index
             await asyncio.sleep(0.1)
 
+    async def _release_browser(self, index: int, browser: Browser) -> None:
+        """
+        Account for a closed context and recycle the browser once it has served
+        `recycle_browser_after` contexts.
+
+        The slot gets a freshly launched browser right away; the retired browser is
+        closed once its last in-flight context has been released.
+        """
+        self.active_contexts[browser] -= 1
+        self.contexts_served[browser] += 1
+
+        if (
+            self.recycle_browser_after
+            and browser not in self.remote_browsers
+            and self.browsers[index] is browser
+            and self.contexts_served[browser] >= self.recycle_browser_after
+        ):
+            async with self.lock:
+                if self.browsers[index] is browser and self.playwright:
+                    try:
+                        new_browser = await self.playwright.chromium.launch(**self.launch_options)
+                    except Exception as e:
+                        # Keep serving from the old browser; the next release retries
+                        print(f"Failed to relaunch browser for recycling: {e}")
+                    else:
+                        self.browsers[index] = new_browser
+                        self._track_browser(new_browser)
+
+        if self.browsers[index] is not browser and self.active_contexts.get(browser) == 0:
+            del self.active_contexts[browser]
+            del self.contexts_served[browser]
+            for context in self.idle_contexts.pop(browser, []):
+                self.context_uses.pop(context, None)
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"Error closing recycled browser: {e}")
+
     @asynccontextmanager
     async def get_context(
         self, **context_kwargs
@@ -157,23 +239,64 @@ class BrowserPool:
         if not self._started:
             raise RuntimeError("BrowserPool not started. Call start() first.")
 
-        browser, sem = await self._get_available_browser()
+        index = await self._get_available_browser()
+        sem = self.browser_semaphores[index]
 
         async with sem:
-            # Apply anti-bot user agent if enabled and not provided
-            if self.enable_anti_bot and "user_agent" not in context_kwargs:
-                context_kwargs["user_agent"] = self.user_agent_generator.random
-
-            context = await browser.new_context(**context_kwargs)
+            # Resolve the browser after acquiring, the slot may have been recycled
+            browser = self.browsers[index]
+            self.active_contexts[browser] += 1
 
-            # Apply stealth techniques
-            if self.enable_anti_bot:
-                await self._apply_anti_bot_measures(context)
+            reusable = bool(self.context_reuse_limit) and not context_kwargs
 
             try:
-                yield context
+                idle = self.idle_contexts.get(browser)
+                if reusable and idle:
+                    context = idle.pop()
+                else:
+                    context = await self._new_context(browser, **context_kwargs)
+
+                try:
+                    yield context
+                finally:
+                    if reusable:
+                        await self._return_context(index, browser, context)
+                    else:
+                        await context.close()
             finally:
-                await context.close()
+                await self._release_browser(index, browser)
+
+    async def _new_context(self, browser: Browser, **context_kwargs) -> BrowserContext:
+        """Create a context on `browser`, applying anti-bot measures if enabled."""
+        # Apply anti-bot user agent if enabled and not provided
+        if self.enable_anti_bot and "user_agent" not in context_kwargs:
+            context_kwargs["user_agent"] = self.user_agent_generator.random
+
+        context = await browser.new_context(**context_kwargs)
+
+        # Apply stealth techniques
+        if self.enable_anti_bot:
+            await self._apply_anti_bot_measures(context)
+
+        return context
+
+    async def _return_context(
+        self, index: int, browser: Browser, context: BrowserContext
+    ) -> None:
+        """Reset a reusable context and park it for the next task, or close it once worn out."""
+        uses = self.context_uses.pop(context, 0) + 1
+        if uses < self.context_reuse_limit and self.browsers[index] is browser:
+            try:
+                for page in context.pages:
+                    await page.close()
+                await context.clear_cookies()
+                self.context_uses[context] = uses
+                self.idle_contexts[browser].append(context)
+                return
+            except Exception as e:
+                print(f"Error resetting pooled context: {e}")
+
+        await context.close()
 
     async def _apply_anti_bot_measures(self, context: BrowserContext) -> None:
         """Apply stealth mode and webdriver hiding to the context."""
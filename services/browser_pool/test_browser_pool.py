@@ -43,3 +43,37 @@ async def test_anti_bot_user_agent_overridden():
             print(f"User Agent (overridden): {user_agent}")
     finally:
         await pool.stop()
+
+@pytest.mark.asyncio
+async def test_browser_recycled_after_limit():
+    pool = BrowserPool(max_browsers=1, recycle_browser_after=2)
+    await pool.start()
+    try:
+        first_browser = pool.browsers[0]
+        for _ in range(2):
+            async with pool.get_context() as context:
+                page = await context.new_page()
+                assert page is not None
+        assert pool.browsers[0] is not first_browser
+        assert not first_browser.is_connected()
+        async with pool.get_context() as context:
+            assert context.browser is pool.browsers[0]
+    finally:
+        await pool.stop()
+
+@pytest.mark.asyncio
+async def test_contexts_reused_when_enabled():
+    pool = BrowserPool(max_contexts_per_browser=1, max_browsers=1, context_reuse_limit=2)
+    await pool.start()
+    try:
+        async with pool.get_context() as first:
+            page = await first.new_page()
+            await page.context.add_cookies([{"name": "a", "value": "1", "url": "https://example.com"}])
+        async with pool.get_context() as second:
+            assert second is first
+            assert second.pages == []
+            assert await second.cookies() == []
+        async with pool.get_context() as third:
+            assert third is not first
+    finally:
+        await pool.stop()
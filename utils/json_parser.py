@@ -1,11 +1,17 @@
 import re
 import json
+import orjson
 def json_parser(input_str: str):
     """Extract and parse JSON from a string."""
     pattern = r"\{.*\}"
     match = re.search(pattern, input_str, re.DOTALL)
     if match:
         json_string = match.group(0)
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            pass
+        # The stdlib parser accepts a few inputs orjson rejects (e.g. NaN/Infinity)
         try:
             json_out = json.loads(json_string)
             return json_out
@@ -1,23 +1,67 @@
 from __future__ import annotations
 import asyncio
 import base64
-import json
+import logging
 import random
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, Callable, Awaitable, AsyncIterator, List, Dict, Any
 from urllib.parse import urlparse
 
+import orjson
 from litellm import acompletion
-from playwright.async_api import BrowserContext, Page
+from playwright.async_api import BrowserContext, CDPSession, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from pydantic import TypeAdapter
 
 from config.logger import logger
 from config.settings import settings
 from utils import json_parser
 
-from .prompts.system_prompt import SYSTEM_PROMPT
+from .prompts.system_prompt import get_system_message
 from .types import VoyagerTask, VoyagerStep, VoyagerAction, VoyagerResult
 from .actions import safe_execute_action
 
+# Validates the whole action list in one call instead of per action
+_ACTIONS_ADAPTER = TypeAdapter(List[VoyagerAction])
+
+# Characters that are not safe in a path segment, mapped to underscores
+_URL_SANITIZE_TABLE = str.maketrans({"/": "_", ":": "_", ".": "_", "-": "_"})
+
+# Shared by reference for every image dropped from the history
+_IMAGE_PLACEHOLDER: Dict[str, str] = {"type": "text", "text": "[Placeholder: image already processed]"}
+
+_SCRIPTS_DIR = Path(__file__).parent / "scripts"
+
+
+def _load_script(path: Path) -> str:
+    """Load JavaScript file with proper error handling."""
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        logger.error(f"Script file not found: {path}")
+        raise
+    except Exception as e:
+        logger.error(f"Error loading script {path}: {e}")
+        raise
+
+
+# Read once at import so creating a Voyager never touches the disk
+_ANNOTATE_JS = _load_script(_SCRIPTS_DIR / "browser-annotate.js")
+_CLEAR_RECTS_JS = _load_script(_SCRIPTS_DIR / "clear-rects.js")
+_INIT_JS = "\n".join((_ANNOTATE_JS, _CLEAR_RECTS_JS))
+
+# The scripts above are installed per page as one init script and only define these
+# globals, so each step sends a short call instead of the full script source
+_ANNOTATE_CALL = "() => window.__voyagerAnnotate()"
+# Same, but also returns the scroll offset needed to clip the screenshot to the viewport
+_ANNOTATE_WITH_SCROLL_CALL = "() => (window.__voyagerAnnotate(), [window.scrollX, window.scrollY])"
+_CLEAR_RECTS_CALL = "() => window.__voyagerClear()"
+
+# CDP returns the JPEG already base64-encoded, skipping PNG encoding and a Python-side b64encode
+_SCREENSHOT_PARAMS: Dict[str, Any] = {"format": "jpeg", "quality": 90, "optimizeForSpeed": True}
+_SCREENSHOT_MIME_TYPE = "image/jpeg"
+
 
 class Voyager:
     """
@@ -32,38 +76,31 @@ class Voyager:
         save_images_for_debugging: bool = False,
         save_message_history_for_debugging: bool = False,
         mimic_human_behaviour: bool = False,
-        max_images_to_include: int = 1
+        max_images_to_include: int = 1,
+        max_history_turns: int = 20,
+        max_screenshot_width: int = 1280
     ) -> None:
-        self.annotate_script = self._load_script("voyager/scripts/browser-annotate.js")
-        self.clear_script = self._load_script("voyager/scripts/clear-rects.js")
-        self.clear_element_tags_script = self._load_script("voyager/scripts/clear-elements.js")
-        self.concurrency_semaphore = asyncio.Semaphore(max_concurrency)
+        self.init_script = _INIT_JS
+        self._max_concurrency = self._validate_concurrency(max_concurrency)
+        self._active_tasks = 0
+        # Created on first use and recreated when an idle Voyager is reused on a new loop
+        self._concurrency_condition: Optional[asyncio.Condition] = None
+        self._concurrency_loop: Optional[asyncio.AbstractEventLoop] = None
         self.return_images = return_images
         self.save_images_for_debugging = save_images_for_debugging
         self.save_message_history_for_debugging = save_message_history_for_debugging
         self.mimic_human_behaviour = mimic_human_behaviour
         self.max_images_to_include = max_images_to_include
-        self.system_prompt = SYSTEM_PROMPT
-
-    @staticmethod
-    def _load_script(path: str) -> str:
-        """Load JavaScript file with proper error handling."""
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
-        except FileNotFoundError:
-            logger.error(f"Script file not found: {path}")
-            raise
-        except Exception as e:
-            logger.error(f"Error loading script {path}: {e}")
-            raise
+        self.max_history_turns = max_history_turns
+        self.max_screenshot_width = max_screenshot_width
+        self._background_tasks: set[asyncio.Task[Any]] = set()
 
     @staticmethod
     def _get_sanitized_task_url_for_path(url: str) -> str:
         """Sanitize a URL to be used as a valid path segment."""
         parsed_url = urlparse(url)
-        # Combine netloc (domain) and path, then replace invalid characters
-        sanitized = (parsed_url.netloc + parsed_url.path).replace('/', '_').replace(':', '_').replace('.', '_').replace('-', '_')
+        # Combine netloc (domain) and path, then replace invalid characters in one pass
+        sanitized = (parsed_url.netloc + parsed_url.path).translate(_URL_SANITIZE_TABLE)
         # Remove any leading/trailing underscores and ensure it's not empty
         return sanitized.strip('_') or "default_task"
 
@@ -82,35 +119,45 @@ class Voyager:
         Returns:
             VoyagerResult: The result of the task execution.
         """
-        async with self.concurrency_semaphore:
+        sanitized_task_url = self._get_sanitized_task_url_for_path(task.start_url)
+
+        screenshots_dir: Optional[Path] = None
+        if self.save_images_for_debugging:
+            screenshots_dir = Path("screenshots") / sanitized_task_url
+            screenshots_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Screenshots will be saved to: {screenshots_dir}")
+
+        message_history = [
+            get_system_message(),
+            {"role": "user", "content": f"Task Assigned by the user: {task.prompt}"}
+        ]
+
+        # Messages are streamed to a JSONL file as they are added, one line each
+        message_history_path: Optional[Path] = None
+        history_write: Optional[asyncio.Task[Any]] = None
+        if self.save_message_history_for_debugging:
+            message_history_dir = Path("Messages") / sanitized_task_url
+            message_history_dir.mkdir(parents=True, exist_ok=True)
+            message_history_path = message_history_dir / "messages.jsonl"
+            logger.info(f"Message history will be saved to: {message_history_path}")
+            history_write = self._save_messages(
+                message_history_path, message_history, None, append=False
+            )
+
+        # Only the page-active part of the task holds a concurrency slot
+        async with self._concurrency_slot():
             task_page = None
+            next_screenshot_task: Optional[asyncio.Task[str]] = None
             success_status = False
             final_url: Optional[str] = None
             final_message: str = "Task did not complete."
             try:
                 logger.info(f"Starting task: '{task.prompt}' at {task.start_url}")
                 task_page = await browser_context.new_page()
+                await task_page.add_init_script(script=self.init_script)
+                cdp_session = await browser_context.new_cdp_session(task_page)
                 await task_page.evaluate("document.body.style.zoom='0.8'")
 
-                sanitized_task_url = self._get_sanitized_task_url_for_path(task.start_url)
-
-                screenshots_dir: Optional[Path] = None
-                if self.save_images_for_debugging:
-                    screenshots_dir = Path("screenshots") / sanitized_task_url
-                    screenshots_dir.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"Screenshots will be saved to: {screenshots_dir}")
-
-                message_history_dir: Optional[Path] = None
-                if self.save_message_history_for_debugging:
-                    message_history_dir = Path("Messages") / sanitized_task_url
-                    message_history_dir.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"Message history will be saved to: {message_history_dir}")
-
-                message_history = [
-                    {"role": "developer", "content": self.system_prompt},
-                    {"role": "user", "content": f"Task Assigned by the user: {task.prompt}"}
-                ]
-
                 await task_page.goto(task.start_url, wait_until="domcontentloaded")
                 
                 execution_log = ""
@@ -121,19 +168,27 @@ class Voyager:
                     iteration += 1
                     logger.info(f"Iteration {iteration}/{task.max_iterations}")
 
-                    # Capture page state with retry logic for navigation handling
-                    screenshot_base64 = await self._capture_annotated_screenshot(
-                        task_page,
-                        max_retries=3,
-                        retry_delay=0.5
-                    )
+                    # Capture page state with retry logic for navigation handling.
+                    # After the first iteration the capture was already started
+                    # right after the previous actions ran.
+                    if next_screenshot_task is not None:
+                        screenshot_base64 = await next_screenshot_task
+                        next_screenshot_task = None
+                    else:
+                        screenshot_base64 = await self._capture_annotated_screenshot(
+                            task_page,
+                            cdp_session,
+                            max_retries=3,
+                            retry_delay=0.5
+                        )
                     if self.mimic_human_behaviour:
                         await self._mimic_human_behavior(task_page)
                     if self.save_images_for_debugging and screenshots_dir:
-                        image_path = screenshots_dir / f"image_{iteration}.png"
-                        with open(image_path, "wb") as f:
-                            f.write(base64.b64decode(screenshot_base64))
-                        logger.debug(f"Saved screenshot to {image_path}")
+                        image_path = screenshots_dir / f"image_{iteration}.jpg"
+                        self._run_in_background(asyncio.to_thread(
+                            self._write_base64, image_path, screenshot_base64
+                        ))
+                        logger.debug(f"Saving screenshot to {image_path}")
                     
                     # Update message history with latest state
                     message_history = self._clear_images_from_history(message_history)
@@ -141,14 +196,14 @@ class Voyager:
                     message_history = self._add_screenshot_message(
                         screenshot_base64,
                         message_history,
-                        execution_log if execution_log else None
+                        execution_log if execution_log else None,
+                        mime_type=_SCREENSHOT_MIME_TYPE
                     )
 
-                    if self.save_message_history_for_debugging and message_history_dir:
-                        message_path = message_history_dir / f"message_{iteration}.json"
-                        with open(message_path, "w", encoding="utf-8") as f:
-                            json.dump(message_history, f, indent=2)
-                        logger.debug(f"Saved message history to {message_path}")
+                    if message_history_path:
+                        history_write = self._save_messages(
+                            message_history_path, message_history[-1:], history_write
+                        )
 
                     # Get AI decision
                     logger.info("Requesting AI decision...")
@@ -161,6 +216,11 @@ class Voyager:
                         break
 
                     message_history.append({"role": "assistant", "content": raw_response})
+                    if message_history_path:
+                        history_write = self._save_messages(
+                            message_history_path, message_history[-1:], history_write
+                        )
+                    self._trim_history(message_history)
 
                     # Execute actions
                     execution_log = "Logs from the last step:\n"
@@ -168,6 +228,13 @@ class Voyager:
                         actions, task_page, execution_log
                     )
 
+                    # Start settling the page and capturing the next screenshot while
+                    # the callback for this step runs
+                    if not (should_stop or task_completed) and iteration < task.max_iterations:
+                        next_screenshot_task = asyncio.create_task(
+                            self._settle_and_capture_screenshot(task_page, cdp_session)
+                        )
+
                     # Invoke callback if provided
                     if task.callback:
                         await task.callback(VoyagerStep(
@@ -187,12 +254,6 @@ class Voyager:
                             final_message = f"Task stopped at {final_url}. Reason: {execution_log}"
                         break
 
-                    # Wait for page stability before next iteration
-                    
-                    await task_page.wait_for_load_state("load")
-                    await asyncio.sleep(1)
-                    await task_page.evaluate(self.clear_element_tags_script)
-
                 if iteration >= task.max_iterations and not task_completed:
                     logger.warning(f"Task reached max iterations ({task.max_iterations}) without completion")
                     success_status = False
@@ -203,9 +264,21 @@ class Voyager:
                 success_status = False
                 final_message = f"Task execution failed due to an unexpected error: {e}"
             finally:
+                # Cancel an unused prefetch and retrieve its outcome so a failed capture
+                # is not reported as an unhandled task exception
+                if next_screenshot_task is not None:
+                    next_screenshot_task.cancel()
+                    try:
+                        await next_screenshot_task
+                    except BaseException:
+                        pass
                 if task_page and not task_page.is_closed():
                     logger.info(f"Closing page for task: '{task.prompt}'")
                     await task_page.close()
+
+                # The history lines are chained, so waiting on the last write flushes them all
+                if history_write is not None:
+                    await asyncio.wait([history_write])
                 
                 return VoyagerResult(
                     final_url=final_url,
@@ -213,34 +286,205 @@ class Voyager:
                     final_message=final_message
                 )
 
+    def _run_in_background(self, coro: Awaitable[Any]) -> asyncio.Task[Any]:
+        """Fire-and-forget a coroutine, keeping a reference until it finishes and logging failures."""
+        background_task = asyncio.ensure_future(coro)
+        self._background_tasks.add(background_task)
+        background_task.add_done_callback(self._on_background_task_done)
+        return background_task
+
+    def _on_background_task_done(self, background_task: asyncio.Task[Any]) -> None:
+        self._background_tasks.discard(background_task)
+        if not background_task.cancelled() and background_task.exception() is not None:
+            logger.warning(f"Background task failed: {background_task.exception()}")
+
+    @staticmethod
+    def _write_base64(path: Path, data_base64: str) -> None:
+        """Decode base64 data and write it to disk; meant to run in a worker thread."""
+        path.write_bytes(base64.b64decode(data_base64))
+
+    def _save_messages(
+        self,
+        path: Path,
+        messages: List[Dict[str, Any]],
+        previous_write: Optional[asyncio.Task[Any]],
+        append: bool = True
+    ) -> asyncio.Task[Any]:
+        """
+        Write messages to a JSONL file in the background, after `previous_write` finishes.
+
+        Messages are serialized immediately since the history is mutated between steps.
+        """
+        lines = b"".join(orjson.dumps(message) + b"\n" for message in messages)
+        return self._run_in_background(
+            self._write_bytes_after(previous_write, path, lines, append)
+        )
+
+    @staticmethod
+    async def _write_bytes_after(
+        previous_write: Optional[asyncio.Task[Any]],
+        path: Path,
+        data: bytes,
+        append: bool
+    ) -> None:
+        """Write bytes off the event loop once the previous write to the same file is done."""
+        if previous_write is not None:
+            await asyncio.wait([previous_write])
+
+        def write() -> None:
+            with path.open("ab" if append else "wb") as f:
+                f.write(data)
+
+        await asyncio.to_thread(write)
+
+    @asynccontextmanager
+    async def _concurrency_slot(self) -> AsyncIterator[None]:
+        """Hold one of the `max_concurrency` task slots for the duration of the block."""
+        condition = self._get_concurrency_condition()
+
+        async with condition:
+            await condition.wait_for(lambda: self._active_tasks < self._max_concurrency)
+            self._active_tasks += 1
+        try:
+            yield
+        finally:
+            # Free the slot before touching the lock so a cancellation while waiting
+            # for it cannot leak the slot; shield the wakeup so it is always delivered
+            self._active_tasks -= 1
+            await asyncio.shield(self._notify_concurrency_waiters(condition))
+
+    @staticmethod
+    async def _notify_concurrency_waiters(condition: asyncio.Condition) -> None:
+        """
+        Wake every waiting task so each re-checks for a free slot.
+
+        Waking just one is not enough: if that waiter is cancelled before it resumes,
+        the wakeup is lost and the rest sleep while the slot stays free.
+        """
+        async with condition:
+            condition.notify_all()
+
+    async def set_concurrency(self, max_concurrency: int) -> None:
+        """
+        Change the number of tasks allowed to run at once.
+
+        Raising the limit admits waiting tasks immediately; lowering it lets running
+        tasks finish and holds back new ones until the count drops below the limit.
+        """
+        max_concurrency = self._validate_concurrency(max_concurrency)
+        condition = self._get_concurrency_condition()
+        async with condition:
+            self._max_concurrency = max_concurrency
+            condition.notify_all()
+
+    def _get_concurrency_condition(self) -> asyncio.Condition:
+        """
+        Return the admission condition for the running loop.
+
+        asyncio primitives stay bound to the loop that first used them, so when no task
+        is active and the Voyager is now driven by a different loop (e.g. a second
+        asyncio.run), a fresh condition is created. Running tasks on two loops at the
+        same time is not supported.
+        """
+        loop = asyncio.get_running_loop()
+        if self._concurrency_condition is None or (
+            self._concurrency_loop is not loop and self._active_tasks == 0
+        ):
+            self._concurrency_condition = asyncio.Condition()
+            self._concurrency_loop = loop
+        return self._concurrency_condition
+
+    @staticmethod
+    def _validate_concurrency(max_concurrency: int) -> int:
+        """Reject limits that would block every task forever."""
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        return max_concurrency
+
+    async def run_tasks(
+        self,
+        browser_context: BrowserContext,
+        tasks: List[VoyagerTask]
+    ) -> List[VoyagerResult | BaseException]:
+        """
+        Run several tasks concurrently in one browser context, bounded by `max_concurrency`.
+        
+        Args:
+            browser_context: Playwright browser context shared by the tasks
+            tasks: VoyagerTasks to execute
+        
+        Returns:
+            List of results in task order; a failing task yields its exception
+            instead of cancelling its siblings.
+        """
+        return await asyncio.gather(
+            *(self.start_task(browser_context, task) for task in tasks),
+            return_exceptions=True
+        )
+
+    async def _settle_and_capture_screenshot(self, page: Page, cdp_session: CDPSession) -> str:
+        """
+        Wait for the page to settle after actions, then capture the next
+        annotated screenshot.
+        """
+        # Bounded wait instead of a fixed sleep; slow trackers should not hold up the step
+        try:
+            await page.wait_for_load_state("load", timeout=5000)
+        except PlaywrightTimeoutError:
+            logger.debug("Page did not reach 'load' within 5s, capturing anyway")
+        return await self._capture_annotated_screenshot(
+            page,
+            cdp_session,
+            max_retries=3,
+            retry_delay=0.5
+        )
+
     async def _capture_annotated_screenshot(
         self, 
         page: Page,
+        cdp_session: CDPSession,
         max_retries: int = 3,
         retry_delay: float = 0.5
     ) -> str:
         """
-        Annotate page elements, capture screenshot, then clear annotations.
+        Annotate page elements, capture a base64 JPEG screenshot over CDP, then clear annotations.
         Implements retry logic to handle navigation-induced execution context destruction.
         """
         for attempt in range(max_retries):
             try:
-                # Wait for page to be stable (but not full networkidle)
-                await page.wait_for_load_state("domcontentloaded")
-                
-                # Small delay to let any immediate navigations settle
-                await asyncio.sleep(0.3)
-                
+                # No up-front load wait here: callers capture right after goto
+                # ("domcontentloaded") or after the post-action "load" wait, so the
+                # only thing left to guard against is a navigation racing the
+                # evaluate calls, which is handled by the retry below.
+
                 # Check if page is still valid before evaluating
                 if page.is_closed():
                     raise RuntimeError("Page was closed during screenshot capture")
                 
                 # Execute operations in sequence with context checks
-                await page.evaluate(self.annotate_script)
-                page_bytes = await page.screenshot()
-                await page.evaluate(self.clear_script)
+                screenshot_params = _SCREENSHOT_PARAMS
+                viewport = page.viewport_size
+                if viewport and viewport["width"] > self.max_screenshot_width:
+                    # Let Chromium downscale wide viewports; the model does not need the extra pixels
+                    scroll_x, scroll_y = await page.evaluate(_ANNOTATE_WITH_SCROLL_CALL)
+                    screenshot_params = {
+                        **_SCREENSHOT_PARAMS,
+                        "clip": {
+                            "x": scroll_x,
+                            "y": scroll_y,
+                            "width": viewport["width"],
+                            "height": viewport["height"],
+                            "scale": self.max_screenshot_width / viewport["width"],
+                        },
+                    }
+                else:
+                    await page.evaluate(_ANNOTATE_CALL)
+                screenshot = await cdp_session.send("Page.captureScreenshot", screenshot_params)
+                # Not awaited: protocol messages are ordered per page, so the overlays are
+                # gone before any later action or annotate call runs
+                self._run_in_background(self._clear_rects_quietly(page))
                 
-                return base64.b64encode(page_bytes).decode()
+                return screenshot["data"]
                 
             except Exception as e:
                 error_msg = str(e).lower()
@@ -252,6 +496,8 @@ class Voyager:
                             f"Navigation detected during screenshot (attempt {attempt + 1}/{max_retries}). "
                             f"Retrying in {retry_delay}s..."
                         )
+                        # Let the navigation that destroyed the context settle
+                        await page.wait_for_load_state("domcontentloaded")
                         await asyncio.sleep(retry_delay)
                         # Increase delay for next attempt
                         retry_delay *= 1.5
@@ -271,6 +517,14 @@ class Voyager:
         
         raise RuntimeError("Unexpected: exited retry loop without return or raise")
 
+    @staticmethod
+    async def _clear_rects_quietly(page: Page) -> None:
+        """Clear annotation overlays, ignoring pages that navigated or closed meanwhile."""
+        try:
+            await page.evaluate(_CLEAR_RECTS_CALL)
+        except Exception as e:
+            logger.debug(f"Skipped clearing annotations: {e}")
+
     async def _mimic_human_behavior(self, page: Page) -> None:
         """Simulate human-like interaction with random mouse movements and scrolling."""
         try:
@@ -315,7 +569,8 @@ class Voyager:
 
         for i, action in enumerate(actions, 1):
             logger.info(f"Executing action {i}/{len(actions)}: {action.type}")
-            logger.debug(action.model_dump())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(action.model_dump())
 
             action_resp = await safe_execute_action(action, page)
 
@@ -356,71 +611,79 @@ class Voyager:
         """
         Replace image_url entries with placeholder text to manage context size,
         keeping the last `max_images_to_include` images.
+
+        Works in place and scans backwards only until it reaches a message that was
+        already cleared on a previous step, so each call touches a constant number
+        of messages.
         
         Args:
             message_history: List of OpenAI-style messages
             
         Returns:
-            Cleaned message history with old images replaced by placeholders.
+            The same message history with old images replaced by placeholders.
         """
-        # Find indices of messages containing images
-        image_message_indices = []
-        for i, message in enumerate(message_history):
-            if "content" in message and isinstance(message["content"], list):
-                if any(part.get("type") == "image_url" for part in message["content"]):
-                    image_message_indices.append(i)
+        if self.max_images_to_include <= 0:
+            return message_history
 
-        # Determine which images to replace
-        images_to_replace_indices = set(image_message_indices[:-self.max_images_to_include])
+        image_messages_seen = 0
+        for message in reversed(message_history):
+            content = message.get("content")
+            if not isinstance(content, list):
+                continue
 
-        if not images_to_replace_indices:
-            return message_history
+            # Everything older than this was cleared on an earlier step
+            if any(part is _IMAGE_PLACEHOLDER for part in content):
+                break
 
-        # Create a new list with old images replaced
-        cleaned_messages = []
-        for i, message in enumerate(message_history):
-            if i in images_to_replace_indices:
-                new_content = [
-                    {"type": "text", "text": "[Placeholder: image already processed]"}
-                    if part.get("type") == "image_url"
-                    else part
-                    for part in message["content"]
-                ]
-                cleaned_messages.append({
-                    "role": message["role"],
-                    "content": new_content
-                })
-            else:
-                cleaned_messages.append(message)
-
-        return cleaned_messages
+            has_image = False
+            for i, part in enumerate(content):
+                if part.get("type") == "image_url":
+                    has_image = True
+                    if image_messages_seen >= self.max_images_to_include:
+                        content[i] = _IMAGE_PLACEHOLDER
+            if has_image:
+                image_messages_seen += 1
+
+        return message_history
+
+    def _trim_history(self, message_history: List[Dict[str, Any]]) -> None:
+        """
+        Keep the system prompt and task message plus the last `max_history_turns`
+        user/assistant turns, dropping older turns in place so every request to the
+        model stays bounded regardless of task length.
+        """
+        max_messages = 2 * self.max_history_turns
+        if max_messages > 0 and len(message_history) > 2 + max_messages:
+            del message_history[2:-max_messages]
 
     @staticmethod
     def _add_screenshot_message(
         screenshot_base64: str,
         message_history: List[Dict[str, Any]],
-        additional_message: Optional[str] = None
+        additional_message: Optional[str] = None,
+        mime_type: str = "image/jpeg"
     ) -> List[Dict[str, Any]]:
         """
         Append a new user message with screenshot and optional text.
         
         Args:
-            screenshot_base64: Base64-encoded screenshot
+            screenshot_base64: Base64-encoded JPEG screenshot
             message_history: Existing message history
             additional_message: Optional text to include before the image
+            mime_type: MIME type of the screenshot for the data URL
             
         Returns:
             Updated message history
         """
-        content: List[Dict[str, Any]] = []
-
-        if additional_message:
-            content.append({"type": "text", "text": additional_message})
-
-        content.append({
+        image_part = {
             "type": "image_url",
-            "image_url": {"url": f"data:image/png;base64,{screenshot_base64}"}
-        })
+            "image_url": {"url": f"data:{mime_type};base64,{screenshot_base64}"}
+        }
+        content: List[Dict[str, Any]] = (
+            [{"type": "text", "text": additional_message}, image_part]
+            if additional_message
+            else [image_part]
+        )
 
         message_history.append({"role": "user", "content": content})
         return message_history
@@ -448,23 +711,22 @@ class Voyager:
         if not model_output or "actions" not in model_output:
             raise ValueError("AI response missing 'actions' field")
 
-        validated_actions = [
-            VoyagerAction.model_validate(action)
-            for action in model_output["actions"]
-        ]
+        validated_actions = _ACTIONS_ADAPTER.validate_python(model_output["actions"])
 
         return validated_actions, raw_response
 
     async def get_page_web_element_rect(self, page: Page) -> Any:
-        """Get annotated element rectangles from the page."""
-        return await page.evaluate(self.annotate_script)
+        """Get annotated element rectangles from a page prepared by start_task."""
+        return await page.evaluate(_ANNOTATE_CALL)
 
     async def clear_rects(self, page: Page) -> None:
-        """Clear annotation rectangles from the page."""
-        await page.evaluate(self.clear_script)
+        """Clear annotation rectangles from a page prepared by start_task."""
+        await page.evaluate(_CLEAR_RECTS_CALL)
 
     async def __aenter__(self) -> "Voyager":
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        pass
+        # Let pending debug writes finish before the caller tears down the loop
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
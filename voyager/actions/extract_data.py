@@ -1,9 +1,11 @@
 from playwright.async_api import Page, Locator
 from typing import Optional
 
+from config.logger import logger
+
 async def execute_extract_data(page : Page, element : Optional[Locator], content : Optional[str] = None):
     """
     This function is a placeholder for invoking a webextractor agent.
     """
-    print(f"Executing extract_data on element: {element} with content: {content}")
+    logger.debug("Executing extract_data on element: %s with content: %r", element, content)
     # TODO: Implement actual webextractor agent invocation
@@ -1,5 +1,10 @@
 from playwright.async_api import Page, Locator
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from typing import Optional
 
 async def execute_wait(page : Page, element : Optional[Locator] = None, content : Optional[str] = None):
-    await page.wait_for_load_state("networkidle")
+    # Pages with polling/analytics may never go idle; wait a bounded time and move on
+    try:
+        await page.wait_for_load_state("networkidle", timeout=5000)
+    except PlaywrightTimeoutError:
+        pass
@@ -1,8 +1,9 @@
 
 import datetime
+from typing import Dict, Optional
 
-SYSTEM_PROMPT = f"""
-Today's date is {datetime.date.today().strftime("%d/%m/%Y")}. Use this for context for any date-related tasks.
+SYSTEM_PROMPT_TEMPLATE = """
+Today's date is {date}. Use this for context for any date-related tasks.
 
 You are a web browser agent, you can interact with a web-browser. You will be provided annotated screenshots to do this, as well a a goal task from a user
 This screenshot will contain the image of the actual webpage with an index around interactable elements. The annotation is not necessarily on the top left of the element; it can be around the box as well, but should be distinctly logically associated with an element.
@@ -89,3 +90,29 @@ You can pick and choose from the above actions on every iteration. The user will
 return "success" only when the task is achieved, or is no longer achievable.
 Every iteration except the first, you can see your previous actions, try to be high reasoning when doing these tasks, look at your past actions for this.
 """
+
+
+_cached_date: Optional[datetime.date] = None
+_cached_message: Dict[str, str] = {}
+
+
+def get_system_message() -> Dict[str, str]:
+    """
+    Return the developer message carrying the system prompt.
+
+    The prompt is formatted once per day and the same dict is shared by every task,
+    so long-running workers pick up the new date after midnight without rebuilding
+    the prompt per task. Callers must not mutate the returned dict.
+    """
+    global _cached_date, _cached_message
+    today = datetime.date.today()
+    if today != _cached_date:
+        _cached_message = {
+            "role": "developer",
+            "content": SYSTEM_PROMPT_TEMPLATE.format(date=today.strftime("%d/%m/%Y")),
+        }
+        _cached_date = today
+    return _cached_message
+
+
+SYSTEM_PROMPT = get_system_message()["content"]
@@ -5,6 +5,11 @@
   const LABEL_PADDING = 3;
 
   function markPage() {
+    // Drop element tags from the previous step so indexes never go stale
+    document
+      .querySelectorAll("[data-voyager-element-index]")
+      .forEach((el) => el.removeAttribute("data-voyager-element-index"));
+
     const vw = Math.max(
       document.documentElement.clientWidth || 0,
       window.innerWidth || 0
@@ -167,5 +172,6 @@
     return depth;
   }
 
-  return markPage();
+  // Installed as an init script; Python triggers it with a tiny evaluate call
+  window.__voyagerAnnotate = markPage;
 })();
@@ -1,6 +1,6 @@
-(function clearRects() {
+window.__voyagerClear = function clearRects() {
   // Remove all overlay boxes
   document
     .querySelectorAll("[data-voyager-rect-index]")
     .forEach((el) => el.remove());
-})();
+};
@@ -0,0 +1,163 @@
+import asyncio
+import pytest
+from . import Voyager, _IMAGE_PLACEHOLDER
+
+
+def run_steps(voyager: Voyager, steps: int):
+    """Drive the history the same way start_task does for `steps` iterations."""
+    message_history = [
+        {"role": "developer", "content": "system"},
+        {"role": "user", "content": "Task Assigned by the user: test"},
+    ]
+    for step in range(steps):
+        message_history = voyager._clear_images_from_history(message_history)
+        message_history = voyager._add_screenshot_message(
+            f"image-{step}", message_history, f"log-{step}"
+        )
+        message_history.append({"role": "assistant", "content": f"reply-{step}"})
+        voyager._trim_history(message_history)
+    return voyager._clear_images_from_history(message_history)
+
+
+def image_urls(message_history):
+    return [
+        part["image_url"]["url"]
+        for message in message_history
+        if isinstance(message["content"], list)
+        for part in message["content"]
+        if part.get("type") == "image_url"
+    ]
+
+
+@pytest.mark.parametrize("keep", [1, 2, 3])
+@pytest.mark.parametrize("turns", [2, 3, 20])
+def test_only_last_images_survive(keep, turns):
+    voyager = Voyager(max_images_to_include=keep, max_history_turns=turns)
+    steps = 6
+    message_history = run_steps(voyager, steps)
+
+    # Trimming can drop screenshots before the image window does
+    kept_steps = range(steps - min(keep, turns), steps)
+    assert image_urls(message_history) == [
+        f"data:image/jpeg;base64,image-{step}" for step in kept_steps
+    ]
+
+    screenshot_messages = [
+        message for message in message_history if isinstance(message["content"], list)
+    ]
+    for message in screenshot_messages[:-len(kept_steps)]:
+        assert message["content"][1] is _IMAGE_PLACEHOLDER
+        assert message["content"][0]["type"] == "text"
+
+
+def test_trim_keeps_system_and_task_messages():
+    voyager = Voyager(max_history_turns=2)
+    message_history = run_steps(voyager, 5)
+
+    assert message_history[0] == {"role": "developer", "content": "system"}
+    assert message_history[1] == {"role": "user", "content": "Task Assigned by the user: test"}
+    assert len(message_history) == 2 + 2 * 2
+    assert [m["content"] for m in message_history if m["role"] == "assistant"] == [
+        "reply-3",
+        "reply-4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_slot_caps_active_tasks():
+    voyager = Voyager(max_concurrency=2)
+    active = 0
+    peak = 0
+
+    async def worker():
+        nonlocal active, peak
+        async with voyager._concurrency_slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+    assert peak == 2
+    assert voyager._active_tasks == 0
+
+
+@pytest.mark.asyncio
+async def test_raising_concurrency_admits_waiters():
+    voyager = Voyager(max_concurrency=1)
+    release = asyncio.Event()
+    second_entered = asyncio.Event()
+
+    async def holder():
+        async with voyager._concurrency_slot():
+            await release.wait()
+
+    async def waiter():
+        async with voyager._concurrency_slot():
+            second_entered.set()
+
+    holder_task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiter_task = asyncio.create_task(waiter())
+    await asyncio.sleep(0.01)
+    assert not second_entered.is_set()
+
+    await voyager.set_concurrency(2)
+    await asyncio.wait_for(second_entered.wait(), timeout=1)
+
+    release.set()
+    await asyncio.gather(holder_task, waiter_task)
+
+
+@pytest.mark.asyncio
+async def test_set_concurrency_rejects_values_below_one():
+    voyager = Voyager()
+    with pytest.raises(ValueError):
+        await voyager.set_concurrency(0)
+    with pytest.raises(ValueError):
+        Voyager(max_concurrency=-1)
+
+
+def test_concurrency_slot_survives_a_new_event_loop():
+    voyager = Voyager(max_concurrency=1)
+
+    async def contend():
+        async def worker():
+            async with voyager._concurrency_slot():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(worker(), worker())
+
+    asyncio.run(contend())
+    asyncio.run(contend())
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_strand_the_slot():
+    voyager = Voyager(max_concurrency=1)
+    release = asyncio.Event()
+    third_entered = asyncio.Event()
+
+    async def holder():
+        async with voyager._concurrency_slot():
+            await release.wait()
+        # The release has just woken the next waiter; cancel it before it resumes
+        second_task.cancel()
+
+    async def waiter(entered: asyncio.Event):
+        async with voyager._concurrency_slot():
+            entered.set()
+
+    holder_task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    second_task = asyncio.create_task(waiter(asyncio.Event()))
+    await asyncio.sleep(0)
+    third_task = asyncio.create_task(waiter(third_entered))
+    await asyncio.sleep(0.01)
+    assert not third_entered.is_set()
+
+    release.set()
+    await asyncio.wait_for(third_entered.wait(), timeout=1)
+
+    await asyncio.gather(holder_task, second_task, third_task, return_exceptions=True)
+    assert voyager._active_tasks == 0